@@ -16,6 +16,39 @@ currentStep = 0
 app = Flask("Traffic Simulation")
 cors = CORS(app, origins=['http://localhost'])
 
+# Read the optional viewport of a position request from the query string.
+# The bounding box is given in grid coordinates (xmin, zmin, xmax, zmax, inclusive),
+# where z corresponds to the row (y coordinate) of the grid in mesa.
+# Missing bounds default to the whole map, so clients that send nothing still get every agent.
+# lod (level of detail) 0 returns every agent; lod n > 0 groups the agents in clusters of n x n buckets.
+def parseViewport():
+    xmin = int(request.args.get('xmin', 0))
+    zmin = int(request.args.get('zmin', 0))
+    xmax = int(request.args.get('xmax', model.width - 1))
+    zmax = int(request.args.get('zmax', model.height - 1))
+    lod = int(request.args.get('lod', 0))
+
+    if lod < 0:
+        raise ValueError(f"Invalid level of detail: {lod}")
+
+    return xmin, zmin, xmax, zmax, lod
+
+# Group agents in square clusters to send a summary instead of every agent.
+# Each cluster has the average position of its agents and how many of them it holds.
+def clusterPositions(agents, lod):
+    size = model.bucket_size * lod
+    clusters = {}
+
+    for (coordinate, a) in agents:
+        key = (coordinate[0] // size, coordinate[1] // size)
+        sx, sz, count = clusters.get(key, (0, 0, 0))
+        clusters[key] = (sx + coordinate[0], sz + coordinate[1], count + 1)
+
+    return [
+        {"x": sx / count, "y":1, "z": sz / count, "count": count}
+        for (sx, sz, count) in clusters.values()
+    ]
+
 # This route will be used to send the parameters of the simulation to the server.
 # The servers expects a POST request with the parameters in a form.
 @app.route('/init', methods=['GET', 'POST'])
@@ -51,19 +84,15 @@ def getCars():
         # Note that the positions are sent as a list of dictionaries, where each dictionary has the id and position of an agent.
         # The y coordinate is set to 1, since the agents are in a 3D world. The z coordinate corresponds to the row (y coordinate) of the grid in mesa.
         try:
-            agentCells = model.grid.all_cells.select(
-                lambda cell: any(isinstance(obj, Car) for obj in cell.agents)
-            ).cells
-            # print(f"CELLS: {agentCells}")
+            xmin, zmin, xmax, zmax, lod = parseViewport()
 
-            agents = [
-                (cell.coordinate, agent)
-                for cell in agentCells
-                for agent in cell.agents
-                if isinstance(agent, Car)
-            ]
+            # Only the buckets of the spatial index that touch the viewport are visited
+            agents = model.query_box(model.car_buckets, xmin, zmin, xmax, zmax)
             # print(f"AGENTS: {agents}")
 
+            if lod > 0:
+                return jsonify({'clusters': clusterPositions(agents, lod)})
+
             agentPositions = [
                 {"id": str(a.unique_id), "x": coordinate[0], "y":1, "z":coordinate[1]}
                 for (coordinate, a) in agents
@@ -71,6 +100,9 @@ def getCars():
             # print(f"AGENT POSITIONS: {agentPositions}")
 
             return jsonify({'positions': agentPositions})
+        except ValueError as e:
+            print(e)
+            return jsonify({"message": "Invalid viewport parameters"}), 400
         except Exception as e:
             print(e)
             return jsonify({"message": "Error with the agent positions"}), 500
@@ -119,17 +151,12 @@ def getTrafficLights():
         try:
             # Get the positions of the traffic lights and return them to WebGL in JSON.json.t.
             # Same as before, the positions are sent as a list of dictionaries, where each dictionary has the id and position of a traffic light.
+            xmin, zmin, xmax, zmax, lod = parseViewport()
 
-            trafficLightCells = model.grid.all_cells.select(
-                lambda cell: any(isinstance(obj, Traffic_Light) for obj in cell.agents)
-            )
+            agents = model.query_box(model.light_buckets, xmin, zmin, xmax, zmax)
 
-            agents = [
-                (cell.coordinate, agent)
-                for cell in trafficLightCells
-                for agent in cell.agents
-                if isinstance(agent, Traffic_Light)
-            ]
+            if lod > 0:
+                return jsonify({'clusters': clusterPositions(agents, lod)})
 
             trafficLightPositions = [
                 {"id": str(a.unique_id), "x": coordinate[0], "y":1, "z":coordinate[1], "state": a.state}
@@ -138,6 +165,9 @@ def getTrafficLights():
             # print(f"TRAFFIC LIGHT POSITIONS: {trafficLightPositions}")
 
             return jsonify({'positions': trafficLightPositions})
+        except ValueError as e:
+            print(e)
+            return jsonify({"message": "Invalid viewport parameters"}), 400
         except Exception as e:
             print(e)
             return jsonify({"message": "Error with traffic light positions"}), 500
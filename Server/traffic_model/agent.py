@@ -8,11 +8,19 @@ class Car(CellAgent):
     # Constructor
     def __init__(self, model, cell):
         super().__init__(model)
-        self.cell = cell        # Current cell
+        self.move_to(cell)      # Current cell
         self.target = None      # Assigned destination
         self.route = []         # Planned route
         self.route_index = 0    # Next step in route
 
+    # Change the current cell of the car
+    # Every change of cell must go through here to keep the spatial index of the model in sync
+    def move_to(self, cell):
+        current = getattr(self, "cell", None)
+        old_pos = tuple(current.coordinate) if current is not None else None
+        self.model.update_car_bucket(self, old_pos, tuple(cell.coordinate))
+        self.cell = cell
+
     # Verify if cell is free of cars or obstacles (apartments)
     # Returns True if free, False otherwise
     # In case of the trafficLights, they do not block the cell, it will be handled in the step()
@@ -135,7 +143,7 @@ class Car(CellAgent):
             # Move to next cell if free
             cell = self.model.grid[(nx,ny)]
             if self.freeCell(cell):
-                self.cell = cell
+                self.move_to(cell)
                 self.route_index += 1
             else:
                 self.route = [] # Recalculate route next time if blocked or the cell sign is opposite
@@ -145,6 +153,12 @@ class Car(CellAgent):
         if tuple(self.cell.coordinate) == tuple(self.target.cell.coordinate):
             self.remove()
 
+    # Remove the car from the model, also dropping it from the spatial index
+    def remove(self):
+        if self.cell is not None:
+            self.model.update_car_bucket(self, tuple(self.cell.coordinate), None)
+        super().remove()
+
 # -----
 # Other Agents: Traffic Light, Obstacle, Destination, Road
 # -----
@@ -22,6 +22,11 @@ class CityModel(Model):
         self.destinations = []
         self.road_positions = []
 
+        # Índice espacial: rejilla uniforme de cubetas (bucket grid) para consultas por viewport
+        self.bucket_size = 8
+        self.car_buckets = {}
+        self.light_buckets = {}
+
         # Cargamos el mapa base
         with open("traffic_model/maps/2023_base.txt") as baseFile:
             lines = baseFile.readlines()
@@ -53,6 +58,7 @@ class CityModel(Model):
                         timeToChange = int(dataDictionary[col])
                         agent = Traffic_Light(self, cell, is_green, timeToChange)
                         self.traffic_lights.append(agent)
+                        self.add_to_bucket(self.light_buckets, agent, pos)
                         self.road_positions.append(pos)
 
                     # --- Destinos ---
@@ -137,6 +143,61 @@ class CityModel(Model):
         """
         return self.map_chars.get(tuple(pos), None)
     
+    # Índice de la cubeta que contiene una posición
+    def bucket_of(self, pos):
+        return (pos[0] // self.bucket_size, pos[1] // self.bucket_size)
+
+    # Agregar un agente a la cubeta de su posición
+    def add_to_bucket(self, buckets, agent, pos):
+        buckets.setdefault(self.bucket_of(pos), set()).add(agent)
+
+    # Quitar un agente de la cubeta de su posición
+    def remove_from_bucket(self, buckets, agent, pos):
+        key = self.bucket_of(pos)
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(agent)
+        if not bucket:
+            del buckets[key]
+
+    # Único punto que actualiza el índice de autos: old_pos o new_pos en None
+    # indican que el auto entra al mapa o sale de él
+    def update_car_bucket(self, car, old_pos, new_pos):
+        old_key = self.bucket_of(old_pos) if old_pos is not None else None
+        new_key = self.bucket_of(new_pos) if new_pos is not None else None
+        if old_key == new_key:
+            return
+        if old_pos is not None:
+            self.remove_from_bucket(self.car_buckets, car, old_pos)
+        if new_pos is not None:
+            self.add_to_bucket(self.car_buckets, car, new_pos)
+
+    # Consultar los agentes dentro de una caja [xmin, xmax] x [zmin, zmax] (inclusiva)
+    def query_box(self, buckets, xmin, zmin, xmax, zmax):
+        """
+        Regresa una lista de (coordenada, agente) dentro de la caja.
+        Solo se recorren las cubetas que tocan la caja, así que el costo es
+        proporcional al área visible y no al tamaño del mapa.
+        """
+        # Recortar la caja a los límites del mapa
+        xmin, zmin = max(xmin, 0), max(zmin, 0)
+        xmax, zmax = min(xmax, self.width - 1), min(zmax, self.height - 1)
+        if xmin > xmax or zmin > zmax:
+            return []
+
+        bx0, bz0 = self.bucket_of((xmin, zmin))
+        bx1, bz1 = self.bucket_of((xmax, zmax))
+
+        found = []
+        for bx in range(bx0, bx1 + 1):
+            for bz in range(bz0, bz1 + 1):
+                for agent in buckets.get((bx, bz), ()):
+                    x, z = agent.cell.coordinate
+                    if xmin <= x <= xmax and zmin <= z <= zmax:
+                        found.append(((x, z), agent))
+        return found
+
     # Elegir un destino aleatorio para un auto
     def get_random_destination(self):
         if len(self.destinations) == 0:
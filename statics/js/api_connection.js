@@ -20,6 +20,9 @@ const trafficLights = [];
 const destinations = [];
 const roads = [];
 
+// Area of the map currently visible, null to request the whole map
+let viewport = null;
+
 // Define the data object
 const initData = {
     NAgents: 5,
@@ -54,11 +57,33 @@ async function initAgentsModel() {
 }
 
 /*
- * Retrieves the current positions of all agents from the agent server.
+ * Sets the bounding box {xmin, zmin, xmax, zmax} used to query the agents,
+ * so the server only sends the ones in view. Pass null to get the whole map.
+ */
+function setViewport(bounds) {
+    viewport = bounds;
+}
+
+/*
+ * Builds the query string with the current viewport for a position request.
+ */
+function viewportQuery() {
+    if (!viewport) return "";
+    const params = new URLSearchParams({
+        xmin: viewport.xmin,
+        zmin: viewport.zmin,
+        xmax: viewport.xmax,
+        zmax: viewport.zmax,
+    });
+    return "?" + params.toString();
+}
+
+/*
+ * Retrieves the current positions of the agents in the viewport from the agent server.
  */
 async function getCars() {
     try {
-        let response = await fetch(agent_server_uri + "getCars");
+        let response = await fetch(agent_server_uri + "getCars" + viewportQuery());
 
         if (response.ok) {
             let result = await response.json();
@@ -66,7 +91,7 @@ async function getCars() {
 
             const aliveCars = new Set(positions.map(car => car.id));
 
-            // Remove cars that are no longer present
+            // Remove cars that are no longer present or left the viewport
             for (let i = cars.length - 1; i >= 0; i--) {
                 const c = cars[i];
                 if (!aliveCars.has(c.id)) {
@@ -130,7 +155,7 @@ async function getObstacles() {
 
 async function getTrafficLights() {
   try {
-    let response = await fetch(agent_server_uri + "getTrafficLights");
+    let response = await fetch(agent_server_uri + "getTrafficLights" + viewportQuery());
 
     if (response.ok) {
       let result = await response.json();
@@ -236,4 +261,4 @@ async function update() {
     }
 }
 
-export { cars, obstacles, trafficLights, roads, destinations, initAgentsModel, update, getCars, getObstacles, getTrafficLights, getDestinations, getRoads };
+export { cars, obstacles, trafficLights, roads, destinations, initAgentsModel, update, setViewport, getCars, getObstacles, getTrafficLights, getDestinations, getRoads };
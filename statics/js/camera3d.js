@@ -11,6 +11,7 @@
  * 2025-07-25
  */
 
+import { V3 } from './3d-lib.js';
 
 class Camera3D {
     constructor(id,
@@ -78,6 +79,50 @@ class Camera3D {
                 this.target.z + this.panOffset[2]];
     }
 
+    // Return an axis aligned box {xmin, zmin, xmax, zmax} on the ground plane (y = 0)
+    // that covers what the camera can see with the given projection.
+    // The four corner rays of the view frustum are intersected with the ground;
+    // rays that never reach it within the far plane are cut at the far plane.
+    viewBounds(fov, aspect, far, margin = 2) {
+        const eye = this.posArray;
+        const target = this.targetArray;
+
+        // Camera axes, same as the ones used by M4.lookAt
+        const forward = V3.normalize(V3.subtract(target, eye));
+        const right = V3.normalize(V3.cross(forward, [0, 1, 0]));
+        const up = V3.cross(right, forward);
+
+        const halfHeight = Math.tan(fov / 2);
+        const halfWidth = halfHeight * aspect;
+
+        // The ground under the camera is always included
+        const xs = [eye[0]];
+        const zs = [eye[2]];
+
+        for (const sx of [-1, 1]) {
+            for (const sy of [-1, 1]) {
+                // Ray with depth 1 along the forward axis, so t is the depth of the hit
+                const dir = V3.add(forward,
+                    V3.add(V3.scale(right, sx * halfWidth), V3.scale(up, sy * halfHeight)));
+
+                let t = far;
+                if (dir[1] < 0) {
+                    t = Math.min(far, -eye[1] / dir[1]);
+                }
+
+                xs.push(eye[0] + dir[0] * t);
+                zs.push(eye[2] + dir[2] * t);
+            }
+        }
+
+        return {
+            xmin: Math.floor(Math.min(...xs) - margin),
+            zmin: Math.floor(Math.min(...zs) - margin),
+            xmax: Math.ceil(Math.max(...xs) + margin),
+            zmax: Math.ceil(Math.max(...zs) + margin),
+        };
+    }
+
     // Methods called to affect the position of the camera
     rotate(deltaAzimuth, deltaElevation) {
         this.azimuth += deltaAzimuth * this.rotationSpeed;
@@ -19,7 +19,7 @@ import { loadMtl } from './obj_loader.js';
 
 import {
   cars, obstacles, trafficLights, destinations, roads, 
-  initAgentsModel, update, getCars, getObstacles,
+  initAgentsModel, update, setViewport, getCars, getObstacles,
   getTrafficLights, getDestinations, getRoads
 } from './api_connection.js';
 
@@ -118,6 +118,11 @@ const settings = {
 let colorProgramInfo = undefined;
 let gl = undefined;
 const duration = 1250; // ms
+
+// Projection used by the camera: field of view of 60 degrees vertically, in radians, and near/far planes
+const CAMERA_FOV = 60 * Math.PI / 180;
+const CAMERA_NEAR = 1;
+const CAMERA_FAR = 200;
 let elapsed = 0;
 let then = 0;
 
@@ -583,6 +588,9 @@ async function drawScene() {
   // Update the scene after the elapsed duration
   if (elapsed >= duration) {
     elapsed = 0;
+    // Only ask the server for the agents around what the camera sees
+    const aspect = gl.canvas.clientWidth / gl.canvas.clientHeight;
+    setViewport(scene.camera.viewBounds(CAMERA_FOV, aspect, CAMERA_FAR));
     await update();
     syncCarObjects();
   }
@@ -591,12 +599,10 @@ async function drawScene() {
 }
 
 function setupViewProjection(gl) {
-  // Field of view of 60 degrees vertically, in radians
-  const fov = 60 * Math.PI / 180;
   const aspect = gl.canvas.clientWidth / gl.canvas.clientHeight;
 
   // Matrices for the world view
-  const projectionMatrix = M4.perspective(fov, aspect, 1, 200);
+  const projectionMatrix = M4.perspective(CAMERA_FOV, aspect, CAMERA_NEAR, CAMERA_FAR);
 
   const cameraPosition = scene.camera.posArray;
   const target = scene.camera.targetArray;